@@ -1,9 +1,11 @@
 import dataclasses
-import json
 import logging
+
+import orjson
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 
 from .input_types import ComponentInfo
 from .input_types import GreppoInputs
@@ -22,10 +24,47 @@ from .layers.tile_layer import TileLayer, TileLayerComponent
 from .layers.wms_tile_layer import WMSTileLayer, WMSTileLayerComponent
 from .layers.vector_layer import VectorLayer, VectorLayerComponent
 from .layers.image_layer import ImageLayer, ImageLayerComponent
-from .layers.raster_layer import RasterLayerComponent
+from .layers.raster_layer import RasterLayerComponent, RasterFileLayerComponent
 from .layers.ee_layer import EarthEngineLayerComponent
 
 
+def _layer_data(layer):
+    """
+    Shallow dict of a layer dataclass built from its declared fields; this
+    skips cache attributes and, unlike `dataclasses.asdict`, copies no
+    values.
+    """
+    return {f.name: getattr(layer, f.name) for f in dataclasses.fields(layer)}
+
+
+def _component_info_data(component_info):
+    """
+    Dict of a ComponentInfo dataclass. Most are flat and their values are
+    shared as-is without a copy, but the chart infos nest ChartData /
+    Dataset dataclasses, which recurse through asdict so the payload
+    stays plain dicts for any JSON renderer.
+    """
+    s = {}
+    for f in dataclasses.fields(component_info):
+        v = getattr(component_info, f.name)
+        if dataclasses.is_dataclass(v):
+            v = dataclasses.asdict(v)
+        s[f.name] = v
+    return s
+
+
+def _vector_layer_geojson(vector_layer: VectorLayer):
+    """
+    GeoJSON for a vector layer, serialized and parsed once and then cached
+    on the layer so repeated payload builds don't re-serialize the frame.
+    """
+    geojson = getattr(vector_layer, "_geojson", None)
+    if geojson is None:
+        geojson = orjson.loads(vector_layer.data.to_json())
+        vector_layer._geojson = geojson
+    return geojson
+
+
 class GreppoApp(object):
     """
     The main Greppo class that is the entry point for user scripts. User scripts will use this class via a module
@@ -77,8 +116,10 @@ class GreppoAppProxy(object):
         self.wms_tile_layers: List[WMSTileLayer] = []
         self.vector_layers: List[VectorLayer] = []
         self.image_layers: List[ImageLayer] = []
-        # TODO Cleanup raster temp
-        # self.raster_image_reference: List[bytes] = []
+        self.raster_image_reference: Dict[str, bytes] = {}
+        # Threads used for per-band raster reprojection; None picks one
+        # thread per band, capped at the CPU count.
+        self.raster_max_workers: Optional[int] = None
         self.registered_inputs: List[ComponentInfo] = []
 
         # Input updates
@@ -165,7 +206,13 @@ class GreppoAppProxy(object):
         self.image_layers.append(image_layer_dataclass)
 
     def raster_layer(self, **kwargs):
-        raster_layer_component = RasterLayerComponent(**kwargs)
+        if 'file_path' in kwargs:
+            kwargs.setdefault('max_workers', self.raster_max_workers)
+            raster_layer_component = RasterFileLayerComponent(**kwargs)
+            self.raster_image_reference[raster_layer_component.id] = \
+                raster_layer_component.png_bytes
+        else:
+            raster_layer_component = RasterLayerComponent(**kwargs)
         image_layer_dataclass = raster_layer_component.convert_to_dataclass()
         self.image_layers.append(image_layer_dataclass)
 
@@ -202,57 +249,40 @@ class GreppoAppProxy(object):
         }
         app_output["map"] = self.map_data
 
-        for _tile_layer in self.tile_layers:
-            s = {}
-            for k, v in _tile_layer.__dict__.items():
-                _v = v
-                s[k] = _v
-            app_output["tile_layer_data"].append(s)
-
-        for _wms_tile_layer in self.wms_tile_layers:
-            s = {}
-            for k, v in _wms_tile_layer.__dict__.items():
-                _v = v
-                s[k] = _v
-            app_output["wms_tile_layer_data"].append(s)
-
-        for _base_layer in self.base_layers:
-            s = {}
-            for k, v in _base_layer.__dict__.items():
-                _v = v
-                s[k] = _v
-            app_output["base_layer_data"].append(s)
+        app_output["tile_layer_data"] = [
+            _layer_data(i) for i in self.tile_layers
+        ]
+        app_output["wms_tile_layer_data"] = [
+            _layer_data(i) for i in self.wms_tile_layers
+        ]
+        app_output["base_layer_data"] = [
+            _layer_data(i) for i in self.base_layers
+        ]
+        app_output["image_layer_data"] = [
+            _layer_data(i) for i in self.image_layers
+        ]
 
         for _vector_layer in self.vector_layers:
-            s = {}
-            for k, v in _vector_layer.__dict__.items():
-                _v = v
-                if k == "data":
-                    _v = json.loads(v.to_json())
-                s[k] = _v
-
+            s = _layer_data(_vector_layer)
+            s["data"] = _vector_layer_geojson(_vector_layer)
             app_output["vector_layer_data"].append(s)
 
-        for _image_layer in self.image_layers:
-            s = {}
-            for k, v in _image_layer.__dict__.items():
-                _v = v
-                s[k] = _v
-            app_output["image_layer_data"].append(s)
-
         app_output["component_info"] = [
-            dataclasses.asdict(i) for i in self.registered_inputs
+            _component_info_data(i) for i in self.registered_inputs
         ]
 
         logging.info("Len component info: ", len(app_output["component_info"]))
 
         return app_output
 
-    # def gpo_reference_data(self):
-    #     """ Only return one reference image for testing. """
-    #     if len(self.raster_image_reference) == 0:
-    #         return None
-    #     return self.raster_image_reference[0]
+    def gpo_reference_data(self):
+        """
+        Raw PNG bytes of the file-based raster layers keyed by layer id,
+        served as-is by the `/raster` endpoint without a base64 round-trip.
+        """
+        if len(self.raster_image_reference) == 0:
+            return None
+        return self.raster_image_reference
 
 
 app = GreppoApp()
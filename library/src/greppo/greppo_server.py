@@ -1,8 +1,10 @@
 import logging
 import os
-from distutils.sysconfig import get_python_lib
+import sysconfig
+from functools import lru_cache
 from functools import partial
 
+import orjson
 import uvicorn
 from greppo import GreppoApp
 from starlette.applications import Starlette
@@ -18,6 +20,28 @@ from starlette.staticfiles import StaticFiles
 
 from .user_script_utils import script_task
 
+try:
+    import uvloop  # noqa: F401
+
+    _EVENT_LOOP = "uvloop"
+except ImportError:
+    # uvloop has no Windows build; uvicorn falls back to asyncio there.
+    _EVENT_LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+
+    _HTTP_PROTOCOL = "httptools"
+except ImportError:
+    _HTTP_PROTOCOL = "h11"
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; numpy scalars serialize natively."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 async def api_endpoint(user_script: str, request: Request):
     input_updates = {}
@@ -29,7 +53,7 @@ async def api_endpoint(user_script: str, request: Request):
 
     payload, _ = await script_task(script_name=user_script, input_updates=input_updates)
 
-    return JSONResponse(payload)
+    return ORJSONResponse(payload)
 
 
 def gen_ws_api_endpoint(user_script):
@@ -65,13 +89,19 @@ async def raster_api_endpoint(user_script: str, request: Request):
 
     _, payload = await script_task(script_name=user_script, input_updates=input_updates)
 
-    image_bytes_data = payload.read() if payload else None
+    # `payload` maps layer ids to raw PNG bytes; stream the requested
+    # layer as-is.
+    image_id = request.query_params.get("id")
+    image_bytes_data = payload.get(image_id) if payload else None
 
+    if image_bytes_data is None:
+        return Response(status_code=404)
     return Response(content=image_bytes_data, media_type="image/png")
 
 
+@lru_cache(maxsize=None)
 def get_static_dir_path():
-    dist_path = get_python_lib() + "/greppo"
+    dist_path = sysconfig.get_paths()["purelib"] + "/greppo"
     if os.path.isfile(dist_path):
         BASE_DIR = dist_path
     else:
@@ -80,6 +110,12 @@ def get_static_dir_path():
     return BASE_DIR + "/static/"
 
 
+@lru_cache(maxsize=None)
+def get_static_files_app():
+    """A single StaticFiles app, shared across server (re)starts."""
+    return StaticFiles(directory=get_static_dir_path(), html=True)
+
+
 class GreppoServer(object):
     def __init__(self, gr_app: GreppoApp, user_script: str):
         self.gr_app = gr_app
@@ -98,7 +134,7 @@ class GreppoServer(object):
             WebSocketRoute("/wsapi", gen_ws_api_endpoint(self.user_script)),
             Mount(
                 "/",
-                app=StaticFiles(directory=get_static_dir_path(), html=True),
+                app=get_static_files_app(),
                 name="static",
             ),
         ]
@@ -117,7 +153,8 @@ class GreppoServer(object):
         ]
 
         app = Starlette(debug=True, routes=routes, middleware=middleware)
-        uvicorn.run(app, host=host, port=port)
+        uvicorn.run(app, host=host, port=port,
+                    loop=_EVENT_LOOP, http=_HTTP_PROTOCOL)
 
     def close(self):
         pass
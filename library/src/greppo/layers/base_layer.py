@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Union
 import xyzservices
-import uuid
+import secrets
 
 
 @dataclass
@@ -29,7 +29,7 @@ class BaseLayerComponent:
         self.bounds = bounds
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
+        id = secrets.token_hex(8)
         tile_provider = None
 
         if self.provider and isinstance(self.provider, str):
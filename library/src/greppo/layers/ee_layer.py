@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List, Union, Dict
 from .tile_layer import TileLayer
 import ee
-import uuid
+import secrets
 
 
 @dataclass
@@ -47,7 +47,7 @@ class EarthEngineLayerComponent:
         self.vis_params = vis_params
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
+        id = secrets.token_hex(8)
         map_id_dict = ee.Image(self.ee_object_image).getMapId(self.vis_params)
         url = map_id_dict["tile_fetcher"].url_format
         return TileLayer(id=id, url=url, name=self.name, description=self.description, visible=self.visible, opacity=self.opacity)
@@ -1,13 +1,23 @@
 from dataclasses import dataclass
 from typing import List
 import numpy as np
-import uuid
+import secrets
 import io
 import base64
 import os
 import json
 from urllib.parse import urlparse, uses_netloc, uses_params, uses_relative
 
+# Formats browsers can display directly from a data URL.
+_WEB_SAFE_EXTS = ('png', 'jpg', 'jpeg')
+
+# data: URL prefixes, precompiled as bytes so the URL is built with one
+# bytes concatenation and a single decode.
+_B64_URL_PREFIX = {
+    ext: 'data:image/{};base64,'.format(ext).encode('ascii')
+    for ext in _WEB_SAFE_EXTS
+}
+
 
 @dataclass
 class ImageLayerComponent:
@@ -25,12 +35,6 @@ class ImageLayerComponent:
         self.visible = visible
         self.opacity = opacity
 
-        # image_ext = image.split(".")[-1].lower()
-        # buffered = io.BytesIO()
-        # image_open = Image.open(image)
-        # image_open.save(buffered, format="JPEG")
-        # image_string = base64.b64encode(buffered.getvalue()).decode()
-        # self.image = f"data:image/{image_ext};base64," + image_string
         self.url = _image_to_url(image)
 
         assert ((len(bounds) == 2) and (len(bounds[0]) == 2) and (
@@ -38,7 +42,7 @@ class ImageLayerComponent:
         self.bounds = bounds
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
+        id = secrets.token_hex(8)
         return ImageLayer(id=id, url=self.url, bounds=self.bounds, name=self.name, description=self.description, visible=self.visible, opacity=self.opacity)
 
 
@@ -66,16 +70,27 @@ def _image_to_url(image):
             "jpeg",
             "tiff",
         ], "Image input extension should be png, jpg or jpeg for image_layer"
-        with io.open(image, 'rb') as f:
-            img = f.read()
-        b64encoded = base64.b64encode(img).decode('utf-8')
-        url = 'data:image/{};base64,{}'.format(img_ext, b64encoded)
+        if img_ext in _WEB_SAFE_EXTS:
+            # Browsers render these natively, so the file bytes are
+            # embedded as-is without a PIL round-trip.
+            with io.open(image, 'rb') as f:
+                img = f.read()
+        else:
+            # Formats like tiff have no browser support; re-encode to PNG
+            # once via PIL.
+            from PIL import Image
+            buffered = io.BytesIO()
+            Image.open(image).save(buffered, format="PNG")
+            img = buffered.getvalue()
+            img_ext = 'png'
+        url = (_B64_URL_PREFIX[img_ext] +
+               base64.b64encode(img)).decode('ascii')
     elif _is_url(image):
         # Round-trip to ensure a nice formatted json.
-        url = json.loads(json.dumps(image))
+        url = json.loads(json.dumps(image)).replace('\n', ' ')
     else:
         assert False, "image not of correct format."
-    return url.replace('\n', ' ')
+    return url
 
 
 def _is_url(url):
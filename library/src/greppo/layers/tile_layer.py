@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-import uuid
+import secrets
 
 
 @dataclass
@@ -19,7 +19,7 @@ class TileLayerComponent:
         self.opacity = opacity
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
+        id = secrets.token_hex(8)
         return TileLayer(id=id, url=self.url, name=self.name, description=self.description, visible=self.visible, opacity=self.opacity)
 
 
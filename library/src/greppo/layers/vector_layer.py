@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Union
-import uuid
+import secrets
 from geopandas import GeoDataFrame as gdf
 from numpy import arange
 from ..colorbrewer import get_palette
@@ -75,10 +75,11 @@ class VectorLayerComponent:
             self.style['choropleth'] = choropleth_style
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
-        gdf_bounds = self.data.total_bounds
-        bounds = [[gdf_bounds[1], gdf_bounds[0]],
-                  [gdf_bounds[3], gdf_bounds[2]]]
+        id = secrets.token_hex(8)
+        # One total_bounds pass; tolist() converts the four numpy scalars
+        # to plain floats in a single call.
+        lon_min, lat_min, lon_max, lat_max = self.data.total_bounds.tolist()
+        bounds = [[lat_min, lon_min], [lat_max, lon_max]]
         return VectorLayer(id=id, data=self.data, name=self.name, description=self.description, style=self.style, visible=self.visible, bounds=bounds)
 
 
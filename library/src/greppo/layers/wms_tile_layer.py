@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Union
-import uuid
+import secrets
 
 
 @dataclass
@@ -30,7 +30,7 @@ class WMSTileLayerComponent:
         self.format = format,
 
     def convert_to_dataclass(self):
-        id = uuid.uuid4().hex
+        id = secrets.token_hex(8)
         return WMSTileLayer(id=id, url=self.url, name=self.name, description=self.description, visible=self.visible, opacity=self.opacity, layers=self.layers, subdomains=self.subdomains, attribution=self.attribution, transparent=self.transparent, format=self.format)
 
 
@@ -6,6 +6,7 @@ Modified version of github.com/rossant/smopy .
 # Imports
 # -----------------------------------------------------------------------------
 import logging
+from functools import lru_cache
 
 import numpy as np
 
@@ -168,9 +169,17 @@ class Map(object):
             self.z = z
 
     def get_allowed_zoom(self, z=18):
-        box_tile = get_tile_box(self.box, z)
-        box = correct_box(box_tile, z)
-        sx, sy = get_box_size(box)
-        if sx * sy >= self.maxtiles:
-            z = self.get_allowed_zoom(z - 1)
-        return z
+        return _allowed_zoom(self.box, z, self.maxtiles)
+
+
+@lru_cache(maxsize=256)
+def _allowed_zoom(box_latlon, z, maxtiles):
+    """Highest zoom <= z whose tile box for `box_latlon` stays under
+    `maxtiles` tiles. Cached, so repeated maps over the same geometry skip
+    the recursive tile-box computation."""
+    box_tile = get_tile_box(box_latlon, z)
+    box = correct_box(box_tile, z)
+    sx, sy = get_box_size(box)
+    if sx * sy >= maxtiles:
+        z = _allowed_zoom(box_latlon, z - 1, maxtiles)
+    return z
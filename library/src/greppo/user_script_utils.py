@@ -1,10 +1,13 @@
 import ast
+import asyncio
+import functools
 import io
 import json
 import logging
 import pathlib
 import secrets
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from _ast import Assign
 from _ast import Attribute
 from _ast import Call
@@ -21,6 +24,18 @@ from .input_types import GreppoInputsNames, GreppoChartNames
 
 logger = logging.getLogger('user_script_utils')
 
+# Pool of worker processes for user script runs, created on first use.
+# Scripts exec arbitrary (often CPU-bound) user code, so running them off
+# the event loop keeps the server responsive.
+_script_executor = None
+
+
+def _get_script_executor():
+    global _script_executor
+    if _script_executor is None:
+        _script_executor = ProcessPoolExecutor()
+    return _script_executor
+
 
 class RenameGreppoAppTransformer(ast.NodeTransformer):
     def __init__(self, hash_prefix):
@@ -54,7 +69,6 @@ def append_send_data_method(code):
 
     return code
 
-# TODO Cleanup of raster
 def append_raster_reference(code):
     code.body.append(
         Assign(
@@ -207,7 +221,7 @@ def run_script(script_name, input_updates, hex_token_generator):
         )
 
         user_code = append_send_data_method(user_code)
-        # user_code = append_raster_reference(user_code)
+        user_code = append_raster_reference(user_code)
 
         # Transform gpo for locals() injection
         hash_prefix = hex_token_generator(nbytes=4)
@@ -233,6 +247,18 @@ def run_script(script_name, input_updates, hex_token_generator):
         return locals_copy["gpo_payload"], raster_reference_payload
 
 
+def _run_script_captured(script_name, input_updates, hex_token_generator):
+    """Run a user script with stdout captured; executes on a pool worker."""
+    with redirect_stdout(io.StringIO()) as loop_out:
+        payload = run_script(
+            script_name=script_name,
+            input_updates=input_updates,
+            hex_token_generator=hex_token_generator,
+        )
+
+    return payload, loop_out.getvalue()
+
+
 async def script_task(
     script_name: str,
     input_updates: Dict[str, Any],
@@ -241,22 +267,29 @@ async def script_task(
     """
     async task that runs a user_script in a Greppo context (`gpo_send_data`) and generates payload for front-end
     consumption.
+
+    The script is exec'd on a background process pool so that long or
+    CPU-bound user code never blocks the event loop.
     """
     # logger.setLevel(logging.DEBUG)
 
     logging.info("Loading Greppo App at: " + script_name)
 
-    with redirect_stdout(io.StringIO()) as loop_out:
-        payload = run_script(
-            script_name=script_name,
-            input_updates=input_updates,
-            hex_token_generator=hex_token_generator,
-        )
+    loop = asyncio.get_running_loop()
+    payload, script_stdout = await loop.run_in_executor(
+        _get_script_executor(),
+        functools.partial(
+            _run_script_captured,
+            script_name,
+            input_updates,
+            hex_token_generator,
+        ),
+    )
 
     logger.debug("-------------")
     logger.debug("stdout from process")
     logger.debug("===")
-    logger.debug(loop_out.getvalue())
+    logger.debug(script_stdout)
     logger.debug("===")
 
     return payload
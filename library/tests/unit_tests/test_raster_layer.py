@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import rasterio
+from rasterio.io import MemoryFile
+from rasterio.transform import from_bounds
+from rasterio.warp import transform_bounds
+
+from greppo import GreppoAppProxy
+
+
+def write_test_tif(file_path, count):
+    width, height = 32, 32
+    transform = from_bounds(-2e6, 2e6, -1e6, 3e6, width, height)
+    data = (np.random.rand(count, height, width) * 255).astype("uint8")
+    with rasterio.open(
+        file_path,
+        "w",
+        driver="GTiff",
+        height=height,
+        width=width,
+        count=count,
+        dtype="uint8",
+        crs="EPSG:3857",
+        transform=transform,
+    ) as dst:
+        dst.write(data)
+
+
+class TestRasterFileLayer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rgb_tif = os.path.join(self.tmp_dir.name, "rgb.tif")
+        self.mono_tif = os.path.join(self.tmp_dir.name, "mono.tif")
+        write_test_tif(self.rgb_tif, count=3)
+        write_test_tif(self.mono_tif, count=1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_raster_layer_round_trip(self):
+        app = GreppoAppProxy()
+        app.raster_layer(file_path=self.rgb_tif, name="rgb")
+
+        self.assertEqual(1, len(app.image_layers))
+        layer = app.image_layers[0]
+        self.assertEqual("/raster?id=" + layer.id, layer.url)
+        self.assertIn(layer.id, app.raster_image_reference)
+
+        png_bytes = app.raster_image_reference[layer.id]
+        with MemoryFile(png_bytes) as memfile:
+            with memfile.open() as png:
+                self.assertEqual("PNG", png.driver)
+                self.assertEqual(4, png.count)
+                self.assertTrue((png.read(4) == 255).all())
+
+        with rasterio.open(self.rgb_tif) as src:
+            lon_min, lat_min, lon_max, lat_max = transform_bounds(
+                src.crs, "EPSG:4326", *src.bounds
+            )
+        # The destination grid is snapped to whole pixels, so allow a
+        # couple of output pixels of slack around the exact bounds.
+        [[bounds_lat_min, bounds_lon_min],
+         [bounds_lat_max, bounds_lon_max]] = layer.bounds
+        self.assertAlmostEqual(lat_min, bounds_lat_min, delta=0.5)
+        self.assertAlmostEqual(lon_min, bounds_lon_min, delta=0.5)
+        self.assertAlmostEqual(lat_max, bounds_lat_max, delta=0.5)
+        self.assertAlmostEqual(lon_max, bounds_lon_max, delta=0.5)
+
+    def test_raster_layer_pads_mono_to_rgba(self):
+        app = GreppoAppProxy()
+        app.raster_layer(file_path=self.mono_tif, name="mono")
+
+        png_bytes = app.raster_image_reference[app.image_layers[0].id]
+        with MemoryFile(png_bytes) as memfile:
+            with memfile.open() as png:
+                self.assertEqual(4, png.count)
+                self.assertTrue((png.read(1) == png.read(2)).all())
+
+    def test_raster_layer_id_stable_across_runs(self):
+        app_1 = GreppoAppProxy()
+        app_1.raster_layer(file_path=self.rgb_tif, name="rgb")
+        app_2 = GreppoAppProxy()
+        app_2.raster_layer(file_path=self.rgb_tif, name="rgb")
+
+        self.assertEqual(app_1.image_layers[0].id, app_2.image_layers[0].id)
+
+
+if __name__ == "__main__":
+    unittest.main()